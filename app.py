@@ -1,6 +1,23 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+
 import cv2
 import numpy as np
 import mediapipe as mp
+from mediapipe.tasks import python as mp_tasks
+from mediapipe.tasks.python import vision
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - the kernel runs as plain Python without it
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+from onnx_pose import OnnxPoseLandmarker
+from stream_capture import ThreadedVideoCapture
 
 # Configuration for 3 doors with DroidCam IPs
 DOOR_CONFIGS = {
@@ -11,10 +28,200 @@ DOOR_CONFIGS = {
     },
 }
 
-# Initialize MediaPipe Pose
-mp_pose = mp.solutions.pose
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
+# MediaPipe Pose Landmarker model (Tasks API), download from:
+# https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/latest/pose_landmarker_lite.task
+POSE_MODEL_PATH = "pose_landmarker_lite.task"
+# "gpu" tries the OpenGL delegate first, "cpu" goes straight to TFLite's XNNPACK
+# CPU path (see the README for using a self-quantized int8 model with it)
+POSE_DELEGATE = "gpu"
+# "mediapipe" (default) or "onnx" - experimental: the BlazePose landmark model
+# exported to ONNX, run with onnxruntime-gpu on TensorRT/CUDA (for NVIDIA GPUs)
+POSE_BACKEND = "mediapipe"
+ONNX_MODEL_PATH = "pose_landmark_lite.onnx"
+
+# Run frame preprocessing (resize, BGR->RGB) through OpenCV's OpenCL T-API.
+# Pays off on integrated GPUs that share memory with the CPU; the HUD is still
+# drawn on the host since it is composed with NumPy sprite blits.
+USE_OPENCL = False
+cv2.ocl.setUseOpenCL(USE_OPENCL)
+
+# OpenCV's per-frame work is tiny; keep its thread pool from competing with
+# MediaPipe's inference threads for the same cores
+cv2.setNumThreads(1)
+# Linux only: give each camera's grab thread a CPU of its own and pin the main
+# thread (plus MediaPipe's workers, which inherit its affinity) to the rest. Off by
+# default - it takes cores away from inference and FFmpeg's decoder threads stay
+# unpinned, so only enable it if measurements on the target machine show a gain
+PIN_CPUS = False
+PoseLandmark = vision.PoseLandmark
+
+# Side of the entry line (int8 codes shared with the matching kernel)
+SIDE_TOP = 0
+SIDE_BOTTOM = 1
+
+# Crossing codes returned by _match_and_gate
+CROSSING_NONE = 0
+CROSSING_ENTRY = 1
+CROSSING_EXIT = 2
+CROSSING_BLOCKED = 3  # Side changed but still inside the debounce window
+
+
+@njit(cache=True, fastmath=True)
+def _match_and_gate(tracked_xy, last_side, frames_since, det_xy, entry_line, match_dist2, debounce):
+    """Match detections to tracks and check them for line crossings.
+    
+    Each detection is matched to its nearest track whose squared distance is
+    below match_dist2 - distances are never square-rooted.
+    Returns per-detection arrays (match_idx, crossing, new_sides) where match_idx
+    is -1 for a new person and crossing is one of the CROSSING_* codes.
+    """
+    n_det = det_xy.shape[0]
+    match_idx = np.full(n_det, -1, dtype=np.int32)
+    crossing = np.zeros(n_det, dtype=np.int8)
+    new_sides = np.zeros(n_det, dtype=np.int8)
+    
+    for i in range(n_det):
+        best_d2 = match_dist2
+        for j in range(tracked_xy.shape[0]):
+            dx = det_xy[i, 0] - tracked_xy[j, 0]
+            dy = det_xy[i, 1] - tracked_xy[j, 1]
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best_d2 = d2
+                match_idx[i] = j
+        
+        side = SIDE_BOTTOM if det_xy[i, 1] > entry_line else SIDE_TOP
+        new_sides[i] = side
+        
+        j = match_idx[i]
+        if j >= 0 and last_side[j] != side:
+            if frames_since[j] >= debounce:
+                crossing[i] = CROSSING_ENTRY if side == SIDE_BOTTOM else CROSSING_EXIT
+            else:
+                crossing[i] = CROSSING_BLOCKED
+    
+    return match_idx, crossing, new_sides
+
+
+def split_cpus(n_io=1):
+    """Split the CPUs we may run on into (compute_cpus, io_cpus).
+    
+    The last n_io CPUs are set aside for I/O - one per camera, each grab thread
+    gets its own - as long as at least two are left for compute; otherwise, or
+    where affinity isn't supported, returns (None, None) and nothing is pinned.
+    """
+    if not hasattr(os, 'sched_setaffinity'):
+        return None, None
+    n_io = max(n_io, 1)
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) - n_io < 2:
+        return None, None
+    return set(cpus[:-n_io]), set(cpus[-n_io:])
+
+
+class OneEuroFilter:
+    """One Euro filter (Casiez et al., 2012) for a single scalar signal.
+    
+    A low-pass filter whose cutoff rises with the signal's speed: slow movement
+    is smoothed heavily (no jitter), fast movement passes with little lag.
+    """
+    
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+    
+    def reset(self):
+        self.t_prev = None
+        self.x_prev = 0.0
+        self.dx_prev = 0.0
+    
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+    
+    def __call__(self, t, x):
+        """Filter sample x taken at time t (seconds)"""
+        if self.t_prev is None:
+            self.t_prev, self.x_prev = t, x
+            return x
+        
+        dt = t - self.t_prev
+        if dt <= 0:
+            return self.x_prev
+        
+        # Smoothed speed drives the cutoff for the value itself
+        a_d = self._alpha(self.d_cutoff, dt)
+        dx_hat = a_d * (x - self.x_prev) / dt + (1 - a_d) * self.dx_prev
+        a = self._alpha(self.min_cutoff + self.beta * abs(dx_hat), dt)
+        x_hat = a * x + (1 - a) * self.x_prev
+        
+        self.t_prev, self.x_prev, self.dx_prev = t, x_hat, dx_hat
+        return x_hat
+
+
+def blit_sprite(frame, pixels, mask, x, y):
+    """Copy a sprite onto frame with its top-left corner at (x, y), clipped to the frame.
+    
+    Only pixels where mask is non-zero are copied; mask=None copies the whole block.
+    """
+    h, w = pixels.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, frame.shape[1]), min(y + h, frame.shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return
+    
+    src = pixels[y0 - y:y1 - y, x0 - x:x1 - x]
+    if mask is None:
+        frame[y0:y1, x0:x1] = src
+    else:
+        cv2.copyTo(src, mask[y0 - y:y1 - y, x0 - x:x1 - x], frame[y0:y1, x0:x1])
+
+
+class SpriteFont:
+    """A cv2.putText style whose rendered strings are cached as sprites.
+    
+    Each string is rasterized once, then blitted with a masked copy on every
+    later frame. draw_chars() composes per-character sprites instead, so
+    changing numbers only ever rasterize the ten digits.
+    """
+    
+    def __init__(self, font, scale, color, thickness):
+        self.font = font
+        self.scale = scale
+        self.color = color
+        self.thickness = thickness
+        self._sprites = {}  # text: (pixels, mask, origin_x, origin_y, advance)
+        self._zero_width = cv2.getTextSize("0", font, scale, thickness)[0][0]
+    
+    def _sprite(self, text):
+        sprite = self._sprites.get(text)
+        if sprite is None:
+            (w, h), baseline = cv2.getTextSize(text, self.font, self.scale, self.thickness)
+            pad = self.thickness  # Strokes spill past getTextSize's box by up to the thickness
+            pixels = np.zeros((h + baseline + 2 * pad, w + 2 * pad, 3), dtype=np.uint8)
+            cv2.putText(pixels, text, (pad, h + pad), self.font, self.scale, self.color, self.thickness)
+            mask = pixels.any(axis=2).astype(np.uint8)
+            
+            # How far putText moves the pen past this text
+            advance = cv2.getTextSize(text + "0", self.font, self.scale, self.thickness)[0][0] - self._zero_width
+            sprite = self._sprites[text] = (pixels, mask, pad, h + pad, advance)
+        return sprite
+    
+    def draw(self, frame, text, org):
+        """Draw text with its bottom-left corner at org (like cv2.putText); returns the next pen x"""
+        pixels, mask, origin_x, origin_y, advance = self._sprite(text)
+        blit_sprite(frame, pixels, mask, org[0] - origin_x, org[1] - origin_y)
+        return org[0] + advance
+    
+    def draw_chars(self, frame, text, org):
+        """Like draw(), but built from per-character sprites - for numbers that change"""
+        x = org[0]
+        for char in text:
+            x = self.draw(frame, char, (x, org[1]))
+        return x
 
 
 class MediaPipePeopleCounter:
@@ -30,188 +237,428 @@ class MediaPipePeopleCounter:
         self.entries = 0
         self.exits = 0
         
+        # Owning LectureHallMonitor - keeps running hall-wide totals
+        self.monitor = None
+        
         # Detection state for UI
         self.is_person_detected = False
         
-        # MediaPipe Pose detector - OPTIMIZED for speed
-        self.pose = mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=0,  # 0 = Lite (fastest)
-            enable_segmentation=False,
-            smooth_landmarks=True,  # Reduce jitter
-            min_detection_confidence=0.3,  # Lower = faster detection
-            min_tracking_confidence=0.3   # Lower = faster tracking
-        )
+        # MediaPipe Pose Landmarker - runs asynchronously, results land in _on_result
+        self._result_lock = threading.Lock()
+        self._latest_result = None
+        self._last_timestamp_ms = -1
+        self.pose = self._create_pose_landmarker()
         
         # Tracking people by their nose landmark
-        self.tracked_people = {}  # person_id: {'position': (x,y), 'last_side': 'top'/'bottom', 'frames_since_crossing': int, 'frames_not_seen': int}
+        # Tracks are kept as struct-of-arrays, compacted so slots [0, _n) are the
+        # live ones and the kernel reads them directly
+        self.MAX_TRACKS = 64  # Far more than a door ever needs
+        self._ids = np.zeros(self.MAX_TRACKS, dtype=np.int32)
+        self._pos = np.zeros((self.MAX_TRACKS, 2), dtype=np.int32)
+        self._side = np.zeros(self.MAX_TRACKS, dtype=np.int8)
+        self._frames_since = np.full(self.MAX_TRACKS, 999, dtype=np.int32)
+        self._not_seen = np.zeros(self.MAX_TRACKS, dtype=np.int32)
+        self._n = 0
         self.next_id = 0
         self.frame_count = 0
         
+        self._det_xy = np.zeros((1, 2), dtype=np.int32)  # Detections handed to the kernel
+        
+        # Tracking events as (time, event, person_id, value), printed off the hot
+        # path by drain_log(); the oldest are dropped if nobody drains them
+        self._log_queue = deque(maxlen=128)
+        
         # Parameters
         self.MATCH_DISTANCE = 80  # Distance threshold for matching people
+        self.MATCH_DISTANCE_SQ = self.MATCH_DISTANCE ** 2  # Matching compares squared distances (no sqrt)
         self.DEBOUNCE_FRAMES = 15  # Must wait 15 frames (~0.5 seconds) before counting another crossing
         self.MIN_DISTANCE_FROM_LINE = 30  # Must be at least 30px away from line to count crossing
         self.MAX_FRAMES_NOT_SEEN = 150  # Keep track for 5 seconds (150 frames @ 30fps) even if not detected
         
-        # Performance optimization
-        self.PROCESS_EVERY_N_FRAMES = 2  # Process every 2nd frame for better performance
+        # Performance optimization: detect once, track cheaply - pose only reruns
+        # when the last result was unsure or the area around the nose changed
+        self.MIN_REUSE_CONFIDENCE = 0.8  # Nose visibility needed to reuse the last landmarks
+        self.MOTION_THRESHOLD = 4.0  # Mean gray-level change around the nose that counts as movement
+        self.MOTION_ROI_SIZE = 64  # Size (px) of the nose window checked for movement
+        self.MAX_REUSE_FRAMES = 15  # Force a pose run at least this often (~0.5s), even when static
+        
+        # Nose smoothing - MediaPipe's landmark filter covers all 33 landmarks but
+        # only the nose is used, so a One Euro filter per axis is applied to it alone
+        self.SMOOTHING_MIN_CUTOFF = 1.0  # Hz - lower = steadier when standing still
+        self.SMOOTHING_BETA = 0.05  # Higher = less lag when moving fast
+        self._nose_filters = (
+            OneEuroFilter(self.SMOOTHING_MIN_CUTOFF, self.SMOOTHING_BETA),
+            OneEuroFilter(self.SMOOTHING_MIN_CUTOFF, self.SMOOTHING_BETA)
+        )
         
-        # Video capture
+        # Landmark cache for skipped frames - the motion check compares against
+        # the nose patch of the last frame pose actually ran on
+        self.last_confidence = 0.0
+        self.last_center = None
+        self.prev_gray_roi = None
+        self._prev_roi_center = None
+        self._reuse_landmarks = False
+        self._reuse_count = 0
+        
+        # UI layout
+        self.STATS_PANEL_HEIGHT = 181  # Rows 0-180 are darkened behind the stats
+        
+        # Entry line and zone labels never change - prerender them as sprites
+        self._line_sprite, self._outside_sprite, self._inside_sprite = self._build_line_sprites(640)
+        
+        # HUD text, rasterized once and blitted every frame
+        self._title_font = SpriteFont(cv2.FONT_HERSHEY_DUPLEX, 0.9, (255, 255, 255), 2)
+        self._status_fonts = {
+            True: SpriteFont(cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2),
+            False: SpriteFont(cv2.FONT_HERSHEY_SIMPLEX, 0.6, (100, 100, 100), 2)
+        }
+        self._door_font = SpriteFont(cv2.FONT_HERSHEY_SIMPLEX, 0.8, (100, 200, 255), 2)
+        self._entries_font = SpriteFont(cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 100), 2)
+        self._exits_font = SpriteFont(cv2.FONT_HERSHEY_SIMPLEX, 0.7, (100, 150, 255), 2)
+        self._occupancy_label_font = SpriteFont(cv2.FONT_HERSHEY_DUPLEX, 0.7, (200, 200, 200), 2)
+        self._occupancy_fonts = {
+            True: SpriteFont(cv2.FONT_HERSHEY_DUPLEX, 2.2, (0, 255, 0), 3),
+            False: SpriteFont(cv2.FONT_HERSHEY_DUPLEX, 2.2, (0, 0, 255), 3)
+        }
+        self._people_font = SpriteFont(cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        
+        # MediaPipe input at the Lite model's native 256x256: the 640x480 frame is
+        # shrunk to 256x192 and letterboxed (bottom rows stay black) to keep its
+        # aspect ratio. mp.Image copies the buffer, so it can be overwritten.
+        self.POSE_INPUT_SIZE = 256
+        self._pose_rows = self.POSE_INPUT_SIZE * 480 // 640
+        self._pose_bgr = np.empty((self._pose_rows, self.POSE_INPUT_SIZE, 3), dtype=np.uint8)
+        self._pose_in = np.zeros((self.POSE_INPUT_SIZE, self.POSE_INPUT_SIZE, 3), dtype=np.uint8)
+        
+        # OpenCL preprocessing, if requested and a device is available
+        self.use_opencl = USE_OPENCL and cv2.ocl.haveOpenCL()
+        
+        # Reusable annotated frame - process_frame returns this buffer, overwritten every frame
+        self._annot = np.empty((480, 640, 3), dtype=np.uint8)
+        
+        # Video capture (grabs on a background thread)
         self.cap = None
     
-    def connect(self):
-        """Connect to camera"""
-        self.cap = cv2.VideoCapture(self.url)
+    def connect(self, cap=None):
+        """Connect to camera and start the background grab thread.
+        
+        Pass an already opened ThreadedVideoCapture to use it instead of opening the URL.
+        """
+        self.cap = cap if cap is not None else ThreadedVideoCapture(self.url, buffer_size=1)
         if not self.cap.isOpened():
             return False
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        
+        # Ask the source for 640x480 MJPEG so we don't decode full-size frames
+        # just to shrink them (sources that ignore this get resized in process_frame)
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        
+        self.cap.start()
         return True
     
-    def get_side(self, y):
-        """Determine which side of line a point is on"""
-        return "bottom" if y > self.entry_line else "top"
+    def _pose_options(self, delegate):
+        """Landmarker options - Lite model in LIVE_STREAM mode, OPTIMIZED for speed"""
+        return vision.PoseLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=POSE_MODEL_PATH, delegate=delegate),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_poses=1,
+            min_pose_detection_confidence=0.3,  # Lower = faster detection
+            min_pose_presence_confidence=0.3,
+            min_tracking_confidence=0.3,  # Lower = faster tracking
+            result_callback=self._on_result
+        )
+    
+    def _create_pose_landmarker(self):
+        """Create the pose landmarker on the configured backend/delegate, falling back to CPU"""
+        if POSE_BACKEND == "onnx":
+            return OnnxPoseLandmarker(ONNX_MODEL_PATH, self._on_result, min_presence=0.3)
+        
+        if POSE_DELEGATE == "gpu":
+            try:
+                return vision.PoseLandmarker.create_from_options(
+                    self._pose_options(mp_tasks.BaseOptions.Delegate.GPU))
+            except (RuntimeError, NotImplementedError):
+                print(f"⚠️  {self.door_name}: GPU delegate unavailable, running pose on CPU")
+        
+        # CPU delegate runs on XNNPACK
+        return vision.PoseLandmarker.create_from_options(
+            self._pose_options(mp_tasks.BaseOptions.Delegate.CPU))
+    
+    def _on_result(self, result, output_image, timestamp_ms):
+        """LIVE_STREAM callback (runs on a MediaPipe thread) - keep the newest result"""
+        with self._result_lock:
+            self._latest_result = (result, timestamp_ms)
+    
+    def _take_result(self):
+        """Return (result, timestamp_ms) for the newest pose result not yet consumed, or (None, None)"""
+        with self._result_lock:
+            latest, self._latest_result = self._latest_result, None
+        return latest if latest is not None else (None, None)
+    
+    def _next_timestamp_ms(self, now_ms=None):
+        """detect_async needs strictly increasing timestamps"""
+        if now_ms is None:
+            now_ms = int(time.monotonic() * 1000)
+        timestamp_ms = max(now_ms, self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
     
-    def get_person_center(self, landmarks, frame_width, frame_height):
-        """Get center position from pose landmarks (using nose or midpoint of shoulders)"""
+    def _build_line_sprites(self, frame_width):
+        """Prerender the glowing entry line and the OUTSIDE/INSIDE labels.
+        
+        Returns (pixels, mask, x, y) tuples for blit_sprite(). The line is a
+        masked strip; the labels are opaque blocks (black box with text).
+        """
+        # Counting line with glow effect, drawn on a strip centred on the line
+        half = 4
+        strip = np.zeros((2 * half + 1, frame_width, 3), dtype=np.uint8)
+        cv2.line(strip, (0, half), (frame_width, half), (0, 200, 255), 5)
+        cv2.line(strip, (0, half), (frame_width, half), (0, 255, 255), 2)
+        line_sprite = (strip, strip.any(axis=2).astype(np.uint8), 0, self.entry_line - half)
+        
+        def label(text, box_width, text_y):
+            # Black box from x=8 (box_width wide, 28 tall) with the text at x=15
+            block = np.zeros((28, box_width, 3), dtype=np.uint8)
+            cv2.putText(block, text, (7, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+            return block
+        
+        outside_sprite = (label("OUTSIDE", 143, 20), None, 8, self.entry_line - 35)
+        inside_sprite = (label("INSIDE", 123, 20), None, 8, self.entry_line + 8)
+        return line_sprite, outside_sprite, inside_sprite
+    
+    def _nose_patch(self, frame, center):
+        """Small downsampled gray patch around center, or None if it's under 2x2 px"""
+        frame_height, frame_width = frame.shape[:2]
+        # Nose coordinates can land outside the frame - clamp them first
+        x = min(max(center[0], 0), frame_width - 1)
+        y = min(max(center[1], 0), frame_height - 1)
+        half = self.MOTION_ROI_SIZE // 2
+        roi = frame[max(y - half, 0):y + half, max(x - half, 0):x + half]
+        if roi.shape[0] < 2 or roi.shape[1] < 2:
+            return None
+        small = cv2.resize(roi, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    
+    def _is_static(self, frame):
+        """True if the last confident person hasn't moved (cheap frame diff around the nose).
+        
+        The patch is compared with the one from the last frame pose ran on, not
+        the previous frame, so slow drift still adds up to MOTION_THRESHOLD.
+        """
+        if self.last_center is None or self.last_confidence < self.MIN_REUSE_CONFIDENCE:
+            self.prev_gray_roi = None
+            self._reuse_count = 0
+            return False
+        
+        static = False
+        if self.prev_gray_roi is not None and self._reuse_count < self.MAX_REUSE_FRAMES:
+            gray = self._nose_patch(frame, self._prev_roi_center)
+            static = (gray is not None and gray.shape == self.prev_gray_roi.shape
+                      and cv2.absdiff(gray, self.prev_gray_roi).mean() < self.MOTION_THRESHOLD)
+        
+        if static:
+            self._reuse_count += 1
+        else:
+            # Pose runs on this frame - it becomes the new reference
+            self.prev_gray_roi = self._nose_patch(frame, self.last_center)
+            self._prev_roi_center = self.last_center
+            self._reuse_count = 0
+        return static
+    
+    def get_person_center(self, landmarks, frame_width, frame_height, timestamp_ms):
+        """Get smoothed center position from pose landmarks (using the nose).
+        
+        Writes into the first row of self._det_xy and returns a view of it.
+        """
         # Use nose landmark (index 0) as the person's center
-        nose = landmarks.landmark[mp_pose.PoseLandmark.NOSE]
+        nose = landmarks[PoseLandmark.NOSE]
         
-        # Convert normalized coordinates to pixel coordinates
-        x = int(nose.x * frame_width)
-        y = int(nose.y * frame_height)
+        # Convert normalized coordinates to pixel coordinates (y is normalized to
+        # the letterboxed input, of which the frame covers the top _pose_rows)
+        x = nose.x * frame_width
+        y = nose.y * self.POSE_INPUT_SIZE / self._pose_rows * frame_height
         
-        return (x, y)
+        # Smooth out landmark jitter before it reaches the tracker
+        t = timestamp_ms / 1000.0
+        self._det_xy[0, 0] = self._nose_filters[0](t, x)
+        self._det_xy[0, 1] = self._nose_filters[1](t, y)
+        
+        return self._det_xy[0]
+    
+    def _free_slot(self):
+        """Index of a free track slot (the stalest track is recycled when all are taken)"""
+        if self._n < self.MAX_TRACKS:
+            self._n += 1
+            return self._n - 1
+        return int(np.argmax(self._not_seen))
     
-    def update_tracking(self, detected_people):
-        """Update person tracking and detect crossings"""
-        current_ids = set()
+    def update_tracking(self, det_xy, detected_people):
+        """Update person tracking and detect crossings.
+        
+        det_xy holds one (x, y) row per entry of detected_people.
+        """
+        n = self._n
         
         # Increment counters for all tracked people
-        for person_id in self.tracked_people:
-            self.tracked_people[person_id]['frames_since_crossing'] += 1
-            self.tracked_people[person_id]['frames_not_seen'] += 1
-        
-        for person_dict in detected_people:
-            pos = person_dict['pos']  # Extract position tuple
-            matched_id = None
-            min_dist = self.MATCH_DISTANCE
-            
-            # Find closest tracked person
-            for person_id, data in self.tracked_people.items():
-                old_pos = data['position']
-                dist = np.sqrt((pos[0] - old_pos[0])**2 + (pos[1] - old_pos[1])**2)
-                if dist < min_dist:
-                    min_dist = dist
-                    matched_id = person_id
+        self._frames_since[:n] += 1
+        self._not_seen[:n] += 1
+        
+        # Match detections and gate crossings in one compiled call
+        match_idx, crossing, new_sides = _match_and_gate(
+            self._pos[:n], self._side[:n], self._frames_since[:n], det_xy,
+            float(self.entry_line), float(self.MATCH_DISTANCE_SQ), self.DEBOUNCE_FRAMES
+        )
+        
+        for i, person_dict in enumerate(detected_people):
+            j = match_idx[i]
+            cross = crossing[i]
             
             # Update existing or create new track
-            if matched_id is not None:
+            if j >= 0:
+                matched_id = int(self._ids[j])
                 person_dict['id'] = matched_id
-                current_ids.add(matched_id)
                 
                 # Reset not_seen counter
-                self.tracked_people[matched_id]['frames_not_seen'] = 0
-                
-                # Get tracking data
-                old_side = self.tracked_people[matched_id]['last_side']
-                new_side = self.get_side(pos[1])
-                frames_since = self.tracked_people[matched_id]['frames_since_crossing']
-                
-                # Check for crossing with debouncing
-                can_cross = (frames_since >= self.DEBOUNCE_FRAMES)
+                self._not_seen[j] = 0
                 
-                if old_side != new_side and can_cross:
-                    # Crossing detected!
-                    if old_side == "top" and new_side == "bottom":
-                        self.entries += 1
-                        print(f"✅ {self.door_name}: ENTRY detected (ID:{matched_id}) | Total IN: {self.entries}")
-                        person_dict['crossing'] = 'entry'
-                        self.tracked_people[matched_id]['frames_since_crossing'] = 0
-                    elif old_side == "bottom" and new_side == "top":
-                        self.exits += 1
-                        print(f"🚪 {self.door_name}: EXIT detected (ID:{matched_id}) | Total OUT: {self.exits}")
-                        person_dict['crossing'] = 'exit'
-                        self.tracked_people[matched_id]['frames_since_crossing'] = 0
-                elif old_side != new_side and not can_cross:
+                if cross == CROSSING_ENTRY:
+                    self.entries += 1
+                    if self.monitor is not None:
+                        self.monitor.total_entries += 1
+                    self._log_queue.append((time.monotonic(), 'entry', matched_id, self.entries))
+                    person_dict['crossing'] = 'entry'
+                    self._frames_since[j] = 0
+                elif cross == CROSSING_EXIT:
+                    self.exits += 1
+                    if self.monitor is not None:
+                        self.monitor.total_exits += 1
+                    self._log_queue.append((time.monotonic(), 'exit', matched_id, self.exits))
+                    person_dict['crossing'] = 'exit'
+                    self._frames_since[j] = 0
+                elif cross == CROSSING_BLOCKED:
                     # Blocked by debounce
                     if self.frame_count % 30 == 0:  # Log occasionally
-                        print(f"🔒 {self.door_name}: Crossing blocked for ID:{matched_id} (debounce={frames_since}f)")
-                
-                # Update position and side
-                self.tracked_people[matched_id]['position'] = pos
-                self.tracked_people[matched_id]['last_side'] = new_side
+                        self._log_queue.append((time.monotonic(), 'blocked', matched_id, int(self._frames_since[j])))
             else:
                 # New person detected
-                person_dict['id'] = self.next_id
-                current_ids.add(self.next_id)
-                self.tracked_people[self.next_id] = {
-                    'position': pos,
-                    'last_side': self.get_side(pos[1]),
-                    'frames_since_crossing': 999,  # Start with high value so first crossing counts
-                    'frames_not_seen': 0
-                }
-                print(f"👤 {self.door_name}: New person detected (ID:{self.next_id})")
+                j = self._free_slot()
+                person_dict['id'] = self._ids[j] = self.next_id
+                self._frames_since[j] = 999  # Start with high value so first crossing counts
+                self._not_seen[j] = 0
+                self._log_queue.append((time.monotonic(), 'new', self.next_id, None))
                 self.next_id += 1
-        
-        # Keep tracks that are still being seen OR haven't been gone too long
-        for person_id in list(self.tracked_people.keys()):
-            if person_id in current_ids or self.tracked_people[person_id]['frames_not_seen'] < self.MAX_FRAMES_NOT_SEEN:
-                continue  # Keep this track
-            else:
-                # Remove old track
-                print(f"❌ {self.door_name}: Lost track of person ID:{person_id}")
-                del self.tracked_people[person_id]
+            
+            # Update position and side
+            self._pos[j] = det_xy[i]
+            self._side[j] = new_sides[i]
+        
+        # Drop tracks that have been gone too long, compacting the survivors to the front
+        n = self._n
+        alive_mask = self._not_seen[:n] < self.MAX_FRAMES_NOT_SEEN
+        if not alive_mask.all():
+            for person_id in self._ids[:n][~alive_mask]:
+                self._log_queue.append((time.monotonic(), 'lost', int(person_id), None))
+            keep = np.nonzero(alive_mask)[0]
+            for track_array in (self._ids, self._pos, self._side, self._frames_since, self._not_seen):
+                track_array[:len(keep)] = track_array[keep]
+            self._n = len(keep)
     
     def process_frame(self, frame):
         """Process a frame and return annotated result"""
-        self.frame_count += 1
+        return self.annotate_frame(self.submit_frame(frame))
+    
+    def submit_frame(self, frame, timestamp_ms=None):
+        """Prepare a frame and hand it to MediaPipe Pose without waiting.
         
-        # Resize to optimized resolution (640x480 for better performance)
-        frame = cv2.resize(frame, (640, 480))
-        frame_height, frame_width = frame.shape[:2]
+        Returns the 640x480 frame to pass to annotate_frame(). Splitting the two
+        lets LectureHallMonitor submit every door before drawing any of them.
+        """
+        self.frame_count += 1
         
-        # Performance optimization: Process every Nth frame
-        should_process = (self.frame_count % self.PROCESS_EVERY_N_FRAMES == 0)
+        # With OpenCL the frame is uploaded once and resized/converted on the device
+        frame_umat = cv2.UMat(frame) if self.use_opencl else None
         
-        results = None
-        if should_process:
-            # Convert BGR to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Resize to optimized resolution (640x480 for better performance) if the
+        # camera didn't deliver it - INTER_AREA is the right kernel for downscaling
+        if frame.shape[:2] != (480, 640):
+            if frame_umat is not None:
+                frame_umat = cv2.resize(frame_umat, (640, 480), interpolation=cv2.INTER_AREA)
+                frame = frame_umat.get()  # Host copy for the motion check and the HUD
+            else:
+                frame = cv2.resize(frame, (640, 480), interpolation=cv2.INTER_AREA)
+        
+        # Performance optimization: skip pose while a confident person stands still
+        self._reuse_landmarks = self._is_static(frame)
+        
+        if not self._reuse_landmarks:
+            # Shrink to the model's input size, then convert BGR to RGB for MediaPipe
+            # (converting after the resize touches 5x fewer pixels)
+            pose_size = (self.POSE_INPUT_SIZE, self._pose_rows)
+            if frame_umat is not None:
+                small = cv2.resize(frame_umat, pose_size, interpolation=cv2.INTER_AREA)
+                self._pose_in[:self._pose_rows] = cv2.cvtColor(small, cv2.COLOR_BGR2RGB).get()
+            else:
+                cv2.resize(frame, pose_size, dst=self._pose_bgr, interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(self._pose_bgr, cv2.COLOR_BGR2RGB, dst=self._pose_in[:self._pose_rows])
             
-            # Process with MediaPipe Pose
-            results = self.pose.process(rgb_frame)
+            # Submit to MediaPipe Pose - inference overlaps with drawing
+            # (the ONNX backend takes the RGB array as is and runs synchronously)
+            if POSE_BACKEND == "onnx":
+                self.pose.detect_async(self._pose_in, self._next_timestamp_ms(timestamp_ms))
+            else:
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=self._pose_in)
+                self.pose.detect_async(mp_image, self._next_timestamp_ms(timestamp_ms))
         
-        # Prepare result image
-        annotated_frame = frame.copy()
+        return frame
+    
+    def annotate_frame(self, frame):
+        """Consume the newest pose result, update tracking and draw the overlay"""
+        frame_height, frame_width = frame.shape[:2]
         
-        # Draw semi-transparent background for stats panel
-        overlay = annotated_frame.copy()
-        cv2.rectangle(overlay, (0, 0), (frame_width, 180), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, annotated_frame, 0.4, 0, annotated_frame)
+        # Newest finished result (from this or an earlier submitted frame)
+        results, result_ms = self._take_result()
         
-        # Draw counting line with glow effect
-        cv2.line(annotated_frame, (0, self.entry_line), (frame_width, self.entry_line), (0, 200, 255), 5)
-        cv2.line(annotated_frame, (0, self.entry_line), (frame_width, self.entry_line), (0, 255, 255), 2)
+        # Prepare result image (in the reused buffer)
+        np.copyto(self._annot, frame)
+        annotated_frame = self._annot
         
-        # Draw zone labels with background
-        cv2.rectangle(annotated_frame, (8, self.entry_line - 35), (150, self.entry_line - 8), (0, 0, 0), -1)
-        cv2.putText(annotated_frame, "OUTSIDE", (15, self.entry_line - 15),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        # Draw semi-transparent background for stats panel
+        # (blending with black == scaling the panel rows by 0.4, done in place)
+        panel = annotated_frame[:self.STATS_PANEL_HEIGHT]
+        cv2.convertScaleAbs(panel, panel, alpha=0.4, beta=0)
         
-        cv2.rectangle(annotated_frame, (8, self.entry_line + 8), (130, self.entry_line + 35), (0, 0, 0), -1)
-        cv2.putText(annotated_frame, "INSIDE", (15, self.entry_line + 28),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        # Draw counting line with glow effect and the zone labels (prerendered)
+        blit_sprite(annotated_frame, *self._line_sprite)
+        blit_sprite(annotated_frame, *self._outside_sprite)
+        blit_sprite(annotated_frame, *self._inside_sprite)
         
         # Detect people (just track head/nose position)
         detected_people = []
-        if should_process and results and results.pose_landmarks:
-            # Get person center (nose position)
-            center = self.get_person_center(results.pose_landmarks, frame_width, frame_height)
+        center = None
+        if results is not None and results.pose_landmarks:
+            # Get person center (nose position) and cache it for skipped frames
+            landmarks = results.pose_landmarks[0]
+            x, y = self.get_person_center(landmarks, frame_width, frame_height, result_ms)
+            center = (int(x), int(y))
+            self.last_confidence = landmarks[PoseLandmark.NOSE].visibility or 0.0
+            self.last_center = center
+        elif results is not None:
+            # Pose ran and found nobody - drop the cache and the smoothing history
+            self.last_confidence = 0.0
+            self.last_center = None
+            for nose_filter in self._nose_filters:
+                nose_filter.reset()
+        elif self._reuse_landmarks:
+            # Static person - carry the previous nose position forward
+            center = self.last_center
+            self._det_xy[0] = center
+        
+        if center is not None:
             detected_people.append({'pos': center})
             
             # Update tracking and detect crossings
-            self.update_tracking(detected_people)
+            self.update_tracking(self._det_xy, detected_people)
             
             # Update detection state for UI
             self.is_person_detected = True
@@ -221,8 +668,8 @@ class MediaPipePeopleCounter:
             cv2.circle(annotated_frame, center, 12, (0, 255, 0), -1)
             cv2.circle(annotated_frame, center, 4, (255, 255, 255), -1)
         else:
-            # No person detected or skipped frame
-            if should_process:
+            # No person detected or no new result this frame
+            if results is not None:
                 self.is_person_detected = False
         
         # Draw tracked people with enhanced visualization
@@ -256,45 +703,60 @@ class MediaPipePeopleCounter:
         total_people = self.entries - self.exits
         
         # Title with status indicator dot
-        cv2.putText(annotated_frame, "FIRE & SAFETY MONITOR", (20, 40),
-                   cv2.FONT_HERSHEY_DUPLEX, 0.9, (255, 255, 255), 2)
+        self._title_font.draw(annotated_frame, "FIRE & SAFETY MONITOR", (20, 40))
         
         # Status dot - lights up when person detected (using persistent state)
         dot_color = (0, 255, 0) if self.is_person_detected else (100, 100, 100)
         cv2.circle(annotated_frame, (400, 30), 12, dot_color, -1)  # Filled circle
         cv2.circle(annotated_frame, (400, 30), 14, dot_color, 2)   # Outer ring
         status_text = "ACTIVE" if self.is_person_detected else "IDLE"
-        cv2.putText(annotated_frame, status_text, (425, 40),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, dot_color, 2)
+        self._status_fonts[self.is_person_detected].draw(annotated_frame, status_text, (425, 40))
         
-        cv2.putText(annotated_frame, self.door_name, (20, 75),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, (100, 200, 255), 2)
+        self._door_font.draw(annotated_frame, self.door_name, (20, 75))
         
-        # Stats with icons
-        cv2.putText(annotated_frame, f"ENTRIES:  {self.entries}", (20, 115),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 100), 2)
-        cv2.putText(annotated_frame, f"EXITS:    {self.exits}", (20, 145),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (100, 150, 255), 2)
+        # Stats with icons (labels are one sprite, counts are composed from digit sprites)
+        x = self._entries_font.draw(annotated_frame, "ENTRIES:  ", (20, 115))
+        self._entries_font.draw_chars(annotated_frame, str(self.entries), (x, 115))
+        x = self._exits_font.draw(annotated_frame, "EXITS:    ", (20, 145))
+        self._exits_font.draw_chars(annotated_frame, str(self.exits), (x, 145))
         
         # Total people - large and prominent
         total_color = (0, 255, 0) if total_people >= 0 else (0, 0, 255)
         cv2.rectangle(annotated_frame, (frame_width - 200, 15), (frame_width - 15, 165), (0, 0, 0), -1)
         cv2.rectangle(annotated_frame, (frame_width - 200, 15), (frame_width - 15, 165), total_color, 3)
-        cv2.putText(annotated_frame, "OCCUPANCY", (frame_width - 185, 50),
-                   cv2.FONT_HERSHEY_DUPLEX, 0.7, (200, 200, 200), 2)
-        cv2.putText(annotated_frame, f"{total_people}", (frame_width - 140, 120),
-                   cv2.FONT_HERSHEY_DUPLEX, 2.2, total_color, 3)
-        cv2.putText(annotated_frame, "people", (frame_width - 125, 150),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        self._occupancy_label_font.draw(annotated_frame, "OCCUPANCY", (frame_width - 185, 50))
+        self._occupancy_fonts[total_people >= 0].draw_chars(annotated_frame, str(total_people), (frame_width - 140, 120))
+        self._people_font.draw(annotated_frame, "people", (frame_width - 125, 150))
         
         return annotated_frame
     
+    def drain_log(self):
+        """Print and clear the queued tracking events"""
+        while self._log_queue:
+            _, event, person_id, value = self._log_queue.popleft()
+            if event == 'entry':
+                print(f"✅ {self.door_name}: ENTRY detected (ID:{person_id}) | Total IN: {value}")
+            elif event == 'exit':
+                print(f"🚪 {self.door_name}: EXIT detected (ID:{person_id}) | Total OUT: {value}")
+            elif event == 'blocked':
+                print(f"🔒 {self.door_name}: Crossing blocked for ID:{person_id} (debounce={value}f)")
+            elif event == 'new':
+                print(f"👤 {self.door_name}: New person detected (ID:{person_id})")
+            elif event == 'lost':
+                print(f"❌ {self.door_name}: Lost track of person ID:{person_id}")
+    
     def reset(self):
         """Reset counters"""
         self.entries = 0
         self.exits = 0
-        self.tracked_people.clear()
+        self._n = 0
         self.next_id = 0
+        self.last_confidence = 0.0
+        self.last_center = None
+        self.prev_gray_roi = None
+        self._reuse_count = 0
+        for nose_filter in self._nose_filters:
+            nose_filter.reset()
     
     def cleanup(self):
         """Release resources"""
@@ -309,12 +771,34 @@ class LectureHallMonitor:
     def __init__(self, door_configs):
         self.door_configs = door_configs
         self.counters = {}
+        
+        # Running totals across all doors, bumped by the counters on each crossing
+        self.total_entries = 0
+        self.total_exits = 0
+        
+        # Dashboard info panel, reallocated only when the dashboard width changes
+        self._info_panel = None
+        
+        # Background thread that prints the counters' queued tracking events
+        self._log_thread = None
+        self._logging = False
     
     def initialize(self):
         """Connect to all cameras"""
         print("🔄 Initializing MediaPipe Pose Detection...")
         print("✅ Using MediaPipe for people detection (No YOLO!)\n")
         
+        # Open every stream before pinning, so FFmpeg's decoder threads (started
+        # on open) keep the full CPU set; only each grab loop moves to its own I/O CPU
+        compute_cpus, io_cpus = split_cpus(len(self.door_configs)) if PIN_CPUS else (None, None)
+        door_cpus = [{cpu} for cpu in sorted(io_cpus)] if io_cpus else [None] * len(self.door_configs)
+        caps = {door_name: ThreadedVideoCapture(config["url"], buffer_size=1, cpu_affinity=cpus)
+                for (door_name, config), cpus in zip(self.door_configs.items(), door_cpus)}
+        
+        # Pin before any landmarker exists so its inference threads inherit the set
+        if compute_cpus is not None:
+            os.sched_setaffinity(0, compute_cpus)
+        
         for door_name, config in self.door_configs.items():
             counter = MediaPipePeopleCounter(
                 door_name,
@@ -323,7 +807,8 @@ class LectureHallMonitor:
                 config.get("direction", "horizontal")
             )
             
-            if counter.connect():
+            if counter.connect(caps[door_name]):
+                counter.monitor = self
                 self.counters[door_name] = counter
                 print(f"✅ {door_name}: Connected")
             else:
@@ -353,11 +838,14 @@ class LectureHallMonitor:
             combined = np.vstack([top, bottom_row])
         
         # Add info panel
-        total_in = sum(c.entries for c in self.counters.values())
-        total_out = sum(c.exits for c in self.counters.values())
+        total_in = self.total_entries
+        total_out = self.total_exits
         occupancy = total_in - total_out
         
-        info_panel = np.zeros((100, combined.shape[1], 3), dtype=np.uint8)
+        if self._info_panel is None or self._info_panel.shape[1] != combined.shape[1]:
+            self._info_panel = np.empty((100, combined.shape[1], 3), dtype=np.uint8)
+        info_panel = self._info_panel
+        info_panel.fill(0)
         cv2.putText(info_panel, "LECTURE HALL OCCUPANCY MONITOR", (20, 35),
                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
         cv2.putText(info_panel, f"Entries: {total_in}  Exits: {total_out}", (20, 70),
@@ -370,6 +858,13 @@ class LectureHallMonitor:
         dashboard = np.vstack([info_panel, combined])
         return dashboard
     
+    def _drain_logs(self):
+        """Log thread - print every counter's tracking events every 0.1s"""
+        while self._logging:
+            time.sleep(0.1)
+            for counter in self.counters.values():
+                counter.drain_log()
+    
     def run(self):
         """Main loop"""
         if not self.initialize():
@@ -379,21 +874,43 @@ class LectureHallMonitor:
         print(f"\n🚀 Monitoring {len(self.counters)} door(s)")
         print("📹 Press 'q' to quit, 'r' to reset\n")
         
+        self._logging = True
+        self._log_thread = threading.Thread(target=self._drain_logs, name="event-log", daemon=True)
+        self._log_thread.start()
+        
         frame_count = 0
         
+        # Latest annotated frame of every door, in self.counters order (black until
+        # a door's first frame) - doors without a new frame keep their last one, so
+        # the dashboard layout stays fixed
+        frames = {name: np.zeros((480, 640, 3), dtype=np.uint8) for name in self.counters}
+        
         while True:
-            # Process each camera (only one for now)
+            # Submit every door's latest frame before drawing any of them, so
+            # the pose graphs for all doors run concurrently in one tick
+            tick_ms = int(time.monotonic() * 1000)
+            submitted = {}
             for name, counter in self.counters.items():
-                ret, frame = counter.cap.read()
+                ret, frame = counter.cap.read()  # Newest frame - never waits on a stalled stream
                 if ret:
-                    processed = counter.process_frame(frame)
-                    # Display directly (no dashboard for single camera)
-                    cv2.imshow("Fire & Safety Monitor - Lecture Hall", processed)
+                    submitted[name] = counter.submit_frame(frame, tick_ms)
+            
+            for name, frame in submitted.items():
+                frames[name] = self.counters[name].annotate_frame(frame)
             
-            # Status update every second
-            frame_count += 1
-            if frame_count % 30 == 0:
-                total = sum(c.entries - c.exits for c in self.counters.values())
+            if len(self.counters) == 1:
+                # Display directly (no dashboard for single camera)
+                for name in submitted:
+                    cv2.imshow("Fire & Safety Monitor - Lecture Hall", frames[name])
+            elif submitted:
+                cv2.imshow("Fire & Safety Monitor - Lecture Hall", self.create_dashboard(frames))
+            
+            # Status update every second (counting ticks that had a new frame,
+            # since reads don't wait and idle ticks only poll the keyboard)
+            if submitted:
+                frame_count += 1
+            if submitted and frame_count % 30 == 0:
+                total = self.total_entries - self.total_exits
                 print(f"📊 Occupancy: {total} people")
             
             # Handle keys
@@ -403,9 +920,16 @@ class LectureHallMonitor:
             elif key == ord('r'):
                 for counter in self.counters.values():
                     counter.reset()
+                self.total_entries = 0
+                self.total_exits = 0
                 print("🔄 Counters reset")
         
         # Cleanup
+        self._logging = False
+        self._log_thread.join()
+        for counter in self.counters.values():
+            counter.drain_log()
+        
         print("\n🛑 Shutting down...")
         for counter in self.counters.values():
             counter.cleanup()
@@ -415,7 +939,7 @@ class LectureHallMonitor:
         print("\n📊 Final Statistics:")
         for name, counter in self.counters.items():
             print(f"  {name}: {counter.entries} in, {counter.exits} out")
-        total = sum(c.entries - c.exits for c in self.counters.values())
+        total = self.total_entries - self.total_exits
         print(f"  Final Occupancy: {total} people")
 
 
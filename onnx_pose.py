@@ -0,0 +1,123 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Only needed for POSE_BACKEND = "onnx"
+    ort = None
+
+
+# Same fields as MediaPipe's NormalizedLandmark, so callers can't tell the backends apart
+Landmark = namedtuple("Landmark", ["x", "y", "z", "visibility", "presence"])
+PoseResult = namedtuple("PoseResult", ["pose_landmarks"])
+
+NUM_LANDMARKS = 33
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class OnnxPoseLandmarker:
+    """BlazePose landmark model on ONNX Runtime (TensorRT / CUDA execution providers).
+
+    Experimental. Mirrors the slice of PoseLandmarker's LIVE_STREAM interface the
+    counter uses: detect_async() runs the model and hands a result with
+    .pose_landmarks to the callback.
+
+    The landmark model expects a crop centred on the person. There is no
+    separate person detector, so the crop is a square around the previous
+    frame's landmarks (ROI_SCALE times their bounding box), and the whole input
+    image is used until a pose has been found. Landmarks are mapped back to the
+    full input image. The crop is not rotated to the body axis like MediaPipe's.
+    """
+
+    PROVIDERS = ["TensorrtExecutionProvider", "CUDAExecutionProvider", "CPUExecutionProvider"]
+    ROI_SCALE = 1.5  # Crop side relative to the previous landmarks' bounding box
+    MIN_ROI_FRACTION = 0.25  # Smallest crop, as a fraction of the input image
+
+    def __init__(self, model_path, result_callback, min_presence=0.5):
+        if ort is None:
+            raise ImportError("POSE_BACKEND = 'onnx' needs onnxruntime-gpu (pip install onnxruntime-gpu)")
+
+        available = ort.get_available_providers()
+        self.session = ort.InferenceSession(model_path, providers=[p for p in self.PROVIDERS if p in available])
+        self.result_callback = result_callback
+        self.min_presence = min_presence
+
+        # tf2onnx keeps the TFLite NHWC layout unless told otherwise - accept both
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.nchw = model_input.shape[1] == 3
+        self.size = model_input.shape[2] if self.nchw else model_input.shape[1]
+        self._input = np.empty((1, 3, self.size, self.size) if self.nchw else (1, self.size, self.size, 3),
+                               dtype=np.float32)
+
+        # Person ROI as (center x, center y, side) in input pixels, None = whole image
+        self._roi = None
+        self._warp = np.zeros((2, 3), dtype=np.float32)
+        self._crop = np.empty((self.size, self.size, 3), dtype=np.uint8)
+
+    def detect_async(self, rgb_image, timestamp_ms):
+        """Run the model on an RGB uint8 array and report through the callback.
+
+        Unlike MediaPipe's detect_async this is synchronous: inference runs on
+        the calling thread, so it does not overlap with drawing the other doors.
+        """
+        height, width = rgb_image.shape[:2]
+        if self._roi is None:
+            cx, cy, side = width / 2, height / 2, max(width, height)
+        else:
+            cx, cy, side = self._roi
+
+        # Scale and shift the ROI square onto the model input (borders are black)
+        scale = self.size / side
+        self._warp[0, 0] = self._warp[1, 1] = scale
+        self._warp[0, 2] = self.size / 2 - cx * scale
+        self._warp[1, 2] = self.size / 2 - cy * scale
+        cv2.warpAffine(rgb_image, self._warp, (self.size, self.size), dst=self._crop,
+                       flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+
+        pixels = self._crop.transpose(2, 0, 1) if self.nchw else self._crop
+        np.multiply(pixels[None], 1.0 / 255.0, out=self._input)
+        outputs = self.session.run(None, {self.input_name: self._input})
+
+        # Landmarks are (1, 39*5) as x, y, z, visibility, presence in crop pixels;
+        # the pose flag is a single presence score
+        raw = next(o for o in outputs if o.ndim == 2 and o.size % 5 == 0 and o.size >= NUM_LANDMARKS * 5)
+        pose_flag = float(next(o for o in outputs if o.size == 1).ravel()[0])
+
+        pose_landmarks = []
+        if pose_flag >= self.min_presence:
+            raw = raw.reshape(-1, 5)[:NUM_LANDMARKS]
+            # Crop pixels back to input pixels
+            xy = (raw[:, :2] - self.size / 2) / scale + (cx, cy)
+            visibility = _sigmoid(raw[:, 3])
+            presence = _sigmoid(raw[:, 4])
+            pose_landmarks.append([
+                Landmark(float(xy[i, 0] / width), float(xy[i, 1] / height), float(raw[i, 2] / self.size),
+                         float(visibility[i]), float(presence[i]))
+                for i in range(NUM_LANDMARKS)
+            ])
+            self._update_roi(xy, visibility, width, height)
+        else:
+            self._roi = None
+
+        self.result_callback(PoseResult(pose_landmarks), None, timestamp_ms)
+
+    def _update_roi(self, xy, visibility, width, height):
+        """Next frame's crop - a square around this frame's visible landmarks"""
+        visible = xy[visibility > 0.5]
+        if len(visible) < 2:
+            visible = xy
+        lo = visible.min(axis=0)
+        hi = visible.max(axis=0)
+        side = max(float((hi - lo).max()) * self.ROI_SCALE, self.MIN_ROI_FRACTION * max(width, height))
+        cx, cy = (lo + hi) / 2
+        self._roi = (float(cx), float(cy), side)
+
+    def close(self):
+        self.session = None
+        self._roi = None
@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+
+import cv2
+
+
+class ThreadedVideoCapture:
+    """cv2.VideoCapture wrapper that grabs frames on a background thread.
+
+    The capture thread keeps pulling frames off the stream so network I/O and
+    JPEG decoding overlap with whatever the caller does between reads, and
+    read() always hands back the newest frame instead of a stale buffered one.
+    """
+
+    def __init__(self, url, buffer_size=1, cpu_affinity=None):
+        self.url = url
+        self.cpu_affinity = cpu_affinity  # CPUs the grab thread pins itself to (Linux)
+        self.cap = cv2.VideoCapture(url)
+        if self.cap.isOpened():
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+        # Latest decoded frame, guarded by the condition's lock
+        self.latest_frame = None
+        self.frame_id = 0
+        self._read_id = 0
+        self._new_frame = threading.Condition()
+
+        self.running = False
+        self.thread = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def set(self, prop_id, value):
+        """Forward a property to the underlying capture (call before start())"""
+        return self.cap.set(prop_id, value)
+
+    def get(self, prop_id):
+        return self.cap.get(prop_id)
+
+    def start(self):
+        """Start the background grab thread"""
+        if self.running:
+            return self
+        self.running = True
+        self.thread = threading.Thread(target=self._update, name=f"capture:{self.url}", daemon=True)
+        self.thread.start()
+        return self
+
+    def _update(self):
+        """Capture loop - grab() every frame, retrieve() to keep the latest"""
+        if self.cpu_affinity and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, self.cpu_affinity)  # 0 = this thread on Linux
+        
+        while self.running:
+            if not self.cap.grab():
+                time.sleep(0.01)  # Stream hiccup - don't spin the CPU
+                continue
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            with self._new_frame:
+                self.latest_frame = frame
+                self.frame_id += 1
+                self._new_frame.notify_all()
+
+        # release() stops waiting after a timeout, so the stream is closed here
+        # once grab() returns rather than under a thread that may still use it
+        self.cap.release()
+
+    def read(self, timeout=0.0):
+        """Return (ret, frame) for the newest frame not yet returned.
+
+        Non-blocking by default: (False, None) if nothing new has arrived. Pass
+        a timeout (seconds) to wait for the capture thread instead. The thread
+        replaces rather than mutates latest_frame, so the returned array is
+        owned by the caller.
+        """
+        with self._new_frame:
+            if not self._new_frame.wait_for(lambda: self.frame_id != self._read_id, timeout):
+                return False, None
+            self._read_id = self.frame_id
+            return True, self.latest_frame
+
+    def release(self):
+        """Stop the grab thread and release the stream"""
+        self.running = False
+        if self.thread is None:
+            self.cap.release()
+            return
+        # The thread releases the stream on its way out - if it is still stuck
+        # in grab() it does so once that returns
+        self.thread.join(timeout=2.0)
+        self.thread = None
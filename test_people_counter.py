@@ -0,0 +1,94 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import cv2
+import numpy as np
+
+import app
+
+
+class FakeLandmarker:
+    """Stands in for PoseLandmarker - reports the nose wherever the test put the head"""
+
+    def __init__(self, counter):
+        self.counter = counter
+        self.head = None
+        self.calls = 0
+
+    def detect_async(self, image, timestamp_ms):
+        self.calls += 1
+        x, y = self.head
+        # Undo get_person_center's mapping: y is normalized to the letterboxed input
+        nose = SimpleNamespace(x=x / 640, y=y / 480 * self.counter._pose_rows / self.counter.POSE_INPUT_SIZE,
+                               visibility=0.95)
+        result = SimpleNamespace(pose_landmarks=[[nose] * 33])
+        self.counter._on_result(result, None, timestamp_ms)
+
+    def close(self):
+        pass
+
+
+def make_counter(entry_line=240):
+    with mock.patch.object(app.MediaPipePeopleCounter, '_create_pose_landmarker', lambda self: None):
+        counter = app.MediaPipePeopleCounter("Door 1", "test", entry_line)
+    counter.pose = FakeLandmarker(counter)
+    return counter
+
+
+def feed(counter, frame, i):
+    """One tick of LectureHallMonitor.run at 30 fps"""
+    counter.annotate_frame(counter.submit_frame(frame, i * 33))
+
+
+def head_frame(x, y):
+    """Gray background with a blurred bright blob for a head at (x, y)"""
+    frame = np.full((480, 640, 3), 60, dtype=np.uint8)
+    cv2.circle(frame, (x, y), 25, (220, 220, 220), -1)
+    return cv2.GaussianBlur(frame, (31, 31), 0)
+
+
+class MotionGateTest(unittest.TestCase):
+
+    def run_walk(self, step):
+        counter = make_counter()
+        for i, y in enumerate(range(150, 351, step)):
+            counter.pose.head = (320, y)
+            feed(counter, head_frame(320, y), i)
+        return counter
+
+    def test_slow_walk_across_line_is_counted(self):
+        # Each frame barely differs from the last, but the drift since the
+        # last pose run must still trigger a new one
+        for step in (1, 2):
+            with self.subTest(step=step):
+                counter = self.run_walk(step)
+                self.assertEqual(counter.entries, 1)
+                self.assertGreater(counter.last_center[1], 300)
+                self.assertGreater(counter.pose.calls, 2)
+
+    def test_still_person_reuses_landmarks(self):
+        counter = make_counter()
+        counter.pose.head = (320, 150)
+        frame = head_frame(320, 150)
+        for i in range(60):
+            feed(counter, frame, i)
+        self.assertLess(counter.pose.calls, 60)
+        # ...but pose still runs every MAX_REUSE_FRAMES
+        self.assertGreaterEqual(counter.pose.calls, 60 // (counter.MAX_REUSE_FRAMES + 1))
+
+    def test_nose_outside_frame(self):
+        counter = make_counter()
+        frame = head_frame(320, 240)
+        for center in [(320, 511), (671, 200), (-31, 200), (320, -31), (-100, -100), (700, 640)]:
+            with self.subTest(center=center):
+                counter.last_center = center
+                counter.last_confidence = 0.9
+                counter.prev_gray_roi = None
+                self.assertFalse(counter._is_static(frame))
+                # Same frame again - matches the clamped reference patch
+                self.assertTrue(counter._is_static(frame))
+
+
+if __name__ == "__main__":
+    unittest.main()